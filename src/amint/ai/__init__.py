@@ -6,12 +6,14 @@ Contains AI client implementations for various providers.
 from .base import AIClient, AIConfig
 from .openai_api import OpenAIAPI
 from .api_key_manager import APIKeyManager
+from .llm_cache import LLMCache
 
 __all__ = [
     "AIClient",
     "AIConfig", 
     "OpenAIAPI",  # Now the primary client
     "APIKeyManager",
+    "LLMCache",
     "DefaultAIClient",  # Alias for OpenAIAPI
     "create_default_gemini_config"  # Helper function
 ]
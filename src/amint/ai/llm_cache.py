@@ -0,0 +1,97 @@
+"""
+LLM response cache for A-MINT.
+Stores responses on disk keyed by a digest of the request inputs, so repeated deterministic calls skip the API.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+class LLMCache:
+    """File-backed cache of LLM responses with a time-to-live per entry."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached response; defaults to
+                $AMINT_LLM_CACHE_DIR, or ~/.cache/amint
+            ttl_seconds: Age after which a cached response is ignored
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else self._default_cache_dir()
+        self.ttl_seconds = ttl_seconds
+        self.prune()
+
+    @staticmethod
+    def _default_cache_dir() -> Path:
+        """Resolve the default cache directory; the home directory is only looked up when needed."""
+        env_dir = os.getenv("AMINT_LLM_CACHE_DIR")
+        if env_dir:
+            return Path(env_dir)
+        return Path.home() / ".cache" / "amint"
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Build a cache key as the SHA-256 of the given parts in canonical JSON form."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def prune(self) -> int:
+        """Delete expired entries so the cache directory does not grow without bound; returns how many were removed."""
+        removed = 0
+        cutoff = time.time() - self.ttl_seconds
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Failed to list LLM cache directory {self.cache_dir}: {e}")
+            return 0
+        for entry in entries:
+            if not entry.name.endswith((".json", ".tmp")):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                # Already removed by another process, or not removable; leave it
+                continue
+        return removed
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing, expired or unreadable."""
+        path = self._entry_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {path}: {e}")
+            return None
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response; failures are logged and otherwise ignored."""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial entry
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                json.dump({"response": response}, f)
+            os.replace(f.name, self._entry_path(key))
+        except OSError as e:
+            logger.warning(f"Failed to write LLM cache entry {key}: {e}")
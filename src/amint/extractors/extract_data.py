@@ -4,8 +4,9 @@ Data extraction module for A-MINT.
 import json
 import logging
 import copy
-from typing import Dict, Any, List, Optional, Set
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from bs4 import BeautifulSoup
 import traceback, os, re
@@ -14,9 +15,49 @@ from soupsieve import SelectorSyntaxError
 from ..ai.base import AIClient, AIConfig
 from .base import BaseExtractor
 from ..models.pricing import PricingData
+from ..utils.file_utils import read_text_once
 
 logger = logging.getLogger(__name__)
 
+# Known placeholders for each prompt type
+PROMPT_PLACEHOLDERS = {
+    'plans_container': ['saas_name', 'html'],
+    'plans_to_markdown': ['saas_name', 'html'],
+    'plans_parse': ['saas_name', 'markdown'],
+    'features_container': ['saas_name', 'html'],
+    'features_to_markdown': ['saas_name', 'html'],
+    'features_validate_markdown': ['saas_name', 'html', 'markdown', 'plans'],
+    'features_parse': ['saas_name', 'markdown', 'plans'],
+    'features_validate': ['saas_name', 'features_json', 'plans'],
+    'add_ons_container': ['saas_name', 'html'],
+    'add_ons_to_markdown': ['saas_name', 'html'],
+    'add_ons_parse': ['saas_name', 'markdown', 'config', 'features', 'plans'],
+    'add_ons_validate': ['saas_name', 'json'],
+    'add_ons_overage': ['saas_name', 'html', 'features', 'config', 'add_ons', 'plans'],
+    'html_to_markdown': ['saas_name', 'html'],
+    'html_validate_markdown': ['saas_name', 'markdown', 'html'],
+    'html_system': [],
+}
+
+def _escape_braces(text: str, placeholders: List[str]) -> str:
+    """Escape all curly braces in text except those wrapping the given placeholders."""
+    text = text.replace('{', '{{').replace('}', '}}')
+    for ph in placeholders:
+        text = text.replace('{{' + ph + '}}', '{' + ph + '}')
+    return text
+
+@lru_cache(maxsize=None)
+def _load_prompt_templates(prompts_dir: Path) -> Dict[str, str]:
+    """Escape every prompt template under prompts_dir, once per process."""
+    templates = {}
+    for category in ["plans", "features", "add_ons", "html"]:
+        category_dir = prompts_dir / category
+        if category_dir.exists():
+            for prompt_file in category_dir.glob("*.md"):
+                key = f"{category}_{prompt_file.stem}"
+                templates[key] = _escape_braces(read_text_once(prompt_file), PROMPT_PLACEHOLDERS.get(key, []))
+    return templates
+
 @dataclass
 class ExtractionConfig:
     """Configuration for data extraction."""
@@ -56,44 +97,7 @@ class ExtractData(BaseExtractor):
     
     def _load_prompts(self) -> None:
         """Load prompt templates from the prompts directory and escape curly braces except for placeholders."""
-        def escape_braces(text, placeholders):
-            import re
-            # Escape all braces
-            text = text.replace('{', '{{').replace('}', '}}')
-            # Unescape placeholders
-            for ph in placeholders:
-                text = text.replace('{{' + ph + '}}', '{' + ph + '}')
-            return text
-
-        # Define known placeholders for each prompt type
-        prompt_placeholders = {
-            'plans_container': ['saas_name', 'html'],
-            'plans_to_markdown': ['saas_name', 'html'],
-            'plans_parse': ['saas_name', 'markdown'],
-            'features_container': ['saas_name', 'html'],
-            'features_to_markdown': ['saas_name', 'html'],
-            'features_validate_markdown': ['saas_name', 'html', 'markdown', 'plans'],
-            'features_parse': ['saas_name', 'markdown', 'plans'],
-            'features_validate': ['saas_name', 'features_json', 'plans'],
-            'add_ons_container': ['saas_name', 'html'],
-            'add_ons_to_markdown': ['saas_name', 'html'],
-            'add_ons_parse': ['saas_name', 'markdown', 'config', 'features', 'plans'],
-            'add_ons_validate': ['saas_name', 'json'],
-            'add_ons_overage': ['saas_name', 'html', 'features', 'config', 'add_ons', 'plans'],
-            'html_to_markdown': ['saas_name', 'html'],
-            'html_validate_markdown': ['saas_name', 'markdown', 'html'],
-            'html_system': [],
-        }
-        for category in ["plans", "features", "add_ons", "html"]:
-            category_dir = self.prompts_dir / category
-            if category_dir.exists():
-                for prompt_file in category_dir.glob("*.md"):
-                    prompt_type = prompt_file.stem
-                    with open(prompt_file, "r") as f:
-                        raw = f.read()
-                        key = f"{category}_{prompt_type}"
-                        placeholders = prompt_placeholders.get(key, [])
-                        self.prompts[key] = escape_braces(raw, placeholders)
+        self.prompts.update(_load_prompt_templates(self.prompts_dir))
 
     def _get_prompt(self, category: str, prompt_type: str) -> str:
         """Get a prompt template.
@@ -669,9 +673,6 @@ class ExtractData(BaseExtractor):
         - Handles explicit 'elements': [{'tag': ..., 'attributes': {...}}].
         - Removes duplicates while preserving document order.
         """
-        collected: List[BeautifulSoup] = []
-        seen: Set[int] = set()
-
         def fallback_by_tag_and_classes(raw_selector: str) -> List[BeautifulSoup]:
             # Remove everything after first pseudo, attribute or combinator
             simple = re.split(r'[:\[>\s]', raw_selector.strip())[0]
@@ -686,31 +687,22 @@ class ExtractData(BaseExtractor):
                 return filtered
             return []
 
-        # 1) CSS selectors
-        for selector in container.get('selectors', []):
+        def select(selector: str) -> List[BeautifulSoup]:
             try:
-                found = self.soup.select(selector)
+                return self.soup.select(selector)
             except SelectorSyntaxError:
-                found = fallback_by_tag_and_classes(selector)
-
-            for el in found:
-                uid = id(el)
-                if uid not in seen:
-                    seen.add(uid)
-                    collected.append(el)
-
-        # 2) Explicit element dicts
-        for element in container.get('elements', []):
-            tag = element.get('tag') or True
-            attrs = element.get('attributes', {})
-            found = self.soup.find_all(tag, attrs=attrs)
-            for el in found:
-                uid = id(el)
-                if uid not in seen:
-                    seen.add(uid)
-                    collected.append(el)
-
-        return collected
+                return fallback_by_tag_and_classes(selector)
+
+        # 1) CSS selectors, then 2) explicit element dicts
+        found = [el for selector in container.get('selectors', []) for el in select(selector)]
+        found += [
+            el
+            for element in container.get('elements', [])
+            for el in self.soup.find_all(element.get('tag') or True, attrs=element.get('attributes', {}))
+        ]
+
+        # Deduplicate by identity; dicts keep the first-seen order
+        return list({id(el): el for el in found}.values())
 
     
     def _update_overage_add_ons(
@@ -800,4 +792,4 @@ class ExtractData(BaseExtractor):
         
         logging.info(f"Converted {category} HTML to Markdown")
         logging.info(response)
-        return response
\ No newline at end of file
+        return response
@@ -2,6 +2,7 @@ import os
 import logging
 import re
 import atexit
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -14,12 +15,24 @@ from bs4 import BeautifulSoup, Comment
 
 logger = logging.getLogger(__name__)
 
+# Tags dropped wholesale while cleaning the page.
+_TAGS_TO_REMOVE = frozenset({
+    'script', 'style', 'link', 'meta', 'noscript', 'head',
+    'header', 'nav', 'form', 'iframe', 'object', 'embed',
+    'picture', 'source', 'canvas', 'audio', 'video', 'map', 'area',
+    'track', 'applet', 'param', 'base', 'template', 'footer'
+})
+
 class WebDriver:
     """
     A robust web scraper utilizing Selenium and BeautifulSoup to fetch and clean
     HTML content, aiming to reduce content size while preserving relevant information,
     especially potential pricing data.
     """
+    # ChromeDriver binaries already installed in this process, keyed by install directory.
+    _installed_paths = {}
+    _install_lock = threading.Lock()
+
     def __init__(self, chromedriver_install_path: str = "/app/chromedriver", page_load_timeout: int = 30):
         self.driver = None
         self.service = None
@@ -34,10 +47,20 @@ class WebDriver:
 
         self._setup_chrome_driver()
 
-    def _setup_chrome_driver(self):
-        try:
+    def _install_chromedriver(self) -> str:
+        """Install ChromeDriver once per process and reuse the binary for later instances."""
+        with WebDriver._install_lock:
+            installed_path = WebDriver._installed_paths.get(self.chromedriver_install_path)
+            if installed_path and os.path.exists(installed_path):
+                return installed_path
             installed_path = chromedriver_autoinstaller.install(path=self.chromedriver_install_path)
+            WebDriver._installed_paths[self.chromedriver_install_path] = installed_path
             logger.info(f"ChromeDriver installed at: {installed_path}")
+            return installed_path
+
+    def _setup_chrome_driver(self):
+        try:
+            installed_path = self._install_chromedriver()
 
             chrome_options = Options()
             chrome_options.add_argument("--headless")
@@ -85,15 +108,11 @@ class WebDriver:
             scripts_to_keep = soup.find_all('script', type='application/ld+json') or []
             scripts_to_keep = [script.__copy__() for script in scripts_to_keep]
 
-            # Remove unwanted tags
-            tags_to_remove = [
-                'script', 'style', 'link', 'meta', 'noscript', 'head', 
-                'header', 'nav', 'form', 'iframe', 'object', 'embed',
-                'picture', 'source', 'canvas', 'audio', 'video', 'map', 'area',
-                'track', 'applet', 'param', 'base', 'template', 'footer'
-            ]
-            for tag in tags_to_remove:
-                for element in soup.find_all(tag):
+            # Remove unwanted tags, collected in a single sweep over the tree
+            targets = [el for el in soup.descendants if el.name in _TAGS_TO_REMOVE]
+            for element in targets:
+                # Nested targets are already gone with their decomposed ancestor
+                if not element.decomposed:
                     element.decompose()
                     
             logger.info("Content length after removing unwanted tags: %d characters", len(str(soup)))
@@ -112,7 +131,8 @@ class WebDriver:
             logger.info("Content length after removing junk selectors: %d characters", len(str(soup)))
 
             # Remove comments
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comments = [el for el in soup.descendants if isinstance(el, Comment)]
+            for comment in comments:
                 comment.extract()
             
             logger.info("Content length after removing comments: %d characters", len(str(soup)))
@@ -169,11 +189,12 @@ class WebDriver:
             raise RuntimeError("WebDriver not initialized.")
         try:
             logger.info(f"Attempting to fetch content from URL: {url}")
+            # driver.get blocks until the load event under the default page load strategy;
+            # the explicit wait only covers pages that swap in their <body> afterwards.
             self.driver.get(url)
             WebDriverWait(self.driver, self.page_load_timeout).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            self.driver.implicitly_wait(10)
             raw_content = self.driver.page_source
             
             # Almacenar tamaño del HTML original
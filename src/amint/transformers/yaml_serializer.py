@@ -1,23 +1,71 @@
 import re
+import string
 import yaml
-from datetime import datetime
+from datetime import date
 from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
+from ..utils.yaml_utils import SafeLoader, SafeDumper
+
+SYNTAX_VERSION = "2.1"
+PRICING_VERSION = "1.0"
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+_ASCII_DIGITS = frozenset(string.digits)
+
+_INF = float("inf")
+
+def _normalize_inf(value: Any) -> Any:
+    """Map the YAML infinity literal ".inf" to a float, leaving any other value untouched."""
+    return _INF if value == ".inf" else value
+
+@lru_cache(maxsize=1)
+def _format_date(day: date) -> str:
+    """Format a creation date, keeping only the most recent one."""
+    return day.strftime("%Y-%m-%d")
 
 @dataclass
 class NameConverter:
-    """Handles name conversion and normalization for different components."""
+    """Handles name conversion and normalization for different components.
     
-    def to_upper_snake(self, name: str) -> str:
+    Conversions are pure, so they are memoized process-wide and shared by every serializer.
+    """
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def to_upper_snake(name: str) -> str:
         """Convert to UPPER_SNAKE_CASE format."""
-        return re.sub(r'\s+', '_', name.upper())
+        upper = name.upper()
+        # Plain single spaces are the only whitespace in the common case; isprintable()
+        # is False for tabs, newlines and non-ASCII spaces, which need the regex.
+        if upper.isprintable() and '  ' not in upper:
+            return upper.replace(' ', '_')
+        return _WHITESPACE_RE.sub('_', upper)
     
-    def to_camel_case(self, name: str) -> str:
-        """Convert to camelCase format."""
-        intermediate = re.sub(r'[^A-Za-z0-9]+', '_', name)
-        lower = intermediate.lower()
-        camelized = re.sub(r'_([a-z])', lambda match: match.group(1).upper(), lower)
-        return camelized.strip('_')
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def to_camel_case(name: str) -> str:
+        """Convert to camelCase format.
+        
+        Runs of characters other than ASCII letters and digits act as word separators:
+        a letter following one is upper-cased, a digit keeps an underscore before it,
+        and separators at either end are dropped.
+        """
+        parts = []
+        separated = False
+        for ch in name:
+            if ch in _ASCII_LETTERS:
+                parts.append(ch.upper() if separated else ch.lower())
+            elif ch in _ASCII_DIGITS:
+                if separated and parts:
+                    parts.append('_')
+                parts.append(ch)
+            else:
+                separated = True
+                continue
+            separated = False
+        return ''.join(parts)
 
 @dataclass
 class NameRegistry:
@@ -31,27 +79,43 @@ class NameRegistry:
     
     def get_plan_name(self, name: str) -> str:
         """Get normalized plan name."""
-        if name not in self.plans:
-            self.plans[name] = self.converter.to_upper_snake(name)
-        return self.plans[name]
+        parsed = self.plans.get(name)
+        if parsed is None:
+            parsed = self.plans[name] = self.converter.to_upper_snake(name)
+        return parsed
     
     def get_feature_name(self, name: str) -> str:
         """Get normalized feature name."""
-        if name not in self.features:
-            self.features[name] = self.converter.to_camel_case(name)
-        return self.features[name]
+        parsed = self.features.get(name)
+        if parsed is None:
+            parsed = self.features[name] = self.converter.to_camel_case(name)
+        return parsed
+    
+    def get_feature_names(self, names: List[str]) -> List[str]:
+        """Get normalized feature names for a batch, registering any not seen yet."""
+        features = self.features
+        to_camel_case = self.converter.to_camel_case
+        parsed_names = []
+        for name in names:
+            parsed = features.get(name)
+            if parsed is None:
+                parsed = features[name] = to_camel_case(name)
+            parsed_names.append(parsed)
+        return parsed_names
     
     def get_usage_limit_name(self, name: str) -> str:
         """Get normalized usage limit name."""
-        if name not in self.usage_limits:
-            self.usage_limits[name] = self.converter.to_camel_case(name)
-        return self.usage_limits[name]
+        parsed = self.usage_limits.get(name)
+        if parsed is None:
+            parsed = self.usage_limits[name] = self.converter.to_camel_case(name)
+        return parsed
     
     def get_add_on_name(self, name: str) -> str:
         """Get normalized add-on name."""
-        if name not in self.add_ons:
-            self.add_ons[name] = self.converter.to_upper_snake(name)
-        return self.add_ons[name]
+        parsed = self.add_ons.get(name)
+        if parsed is None:
+            parsed = self.add_ons[name] = self.converter.to_upper_snake(name)
+        return parsed
 
 @dataclass
 class ConfigBuilder:
@@ -66,10 +130,10 @@ class ConfigBuilder:
     def build_base_config(self) -> Dict[str, Any]:
         """Build the base configuration structure."""
         return {
-            'syntaxVersion': "2.1",
+            'syntaxVersion': SYNTAX_VERSION,
             'saasName': self.saas_name,
-            'version': "1.0",
-            'createdAt': datetime.now().strftime("%Y-%m-%d"),
+            'version': PRICING_VERSION,
+            'createdAt': _format_date(date.today()),
             'url': self.url
         }
     
@@ -100,13 +164,13 @@ class PlanParser(ComponentParser):
         if raw_plans:
             self.config.default_plan = self.names.get_plan_name(raw_plans[0].get('name', 'DEFAULT'))
             
+        get_plan_name = self.names.get_plan_name
         for plan in raw_plans:
             raw_plan_name = plan.pop('name', None)
             if raw_plan_name:
-                parsed_plan_name = self.names.get_plan_name(raw_plan_name)
-                plans[parsed_plan_name] = plan
-                plans[parsed_plan_name].setdefault('features', None)
-                plans[parsed_plan_name].setdefault('usageLimits', None)
+                plan.setdefault('features', None)
+                plan.setdefault('usageLimits', None)
+                plans[get_plan_name(raw_plan_name)] = plan
         
         return plans
 
@@ -118,13 +182,20 @@ class FeatureParser(ComponentParser):
         features = {}
         usage_limits = {}
         
+        # Pop and normalize every feature name up front, in a single registry pass
+        named_features = []
+        raw_feature_names = []
         for feature in features_data:
             raw_feature_name = feature.pop('name', None)
-            if not raw_feature_name:
-                continue
-                
-            parsed_feature_name = self.names.get_feature_name(raw_feature_name)
-            feature_data, usage_limit = self._process_feature(feature, parsed_feature_name, plans)
+            if raw_feature_name:
+                named_features.append(feature)
+                raw_feature_names.append(raw_feature_name)
+        parsed_feature_names = self.names.get_feature_names(raw_feature_names)
+        # Set by PlanParser and fixed for the rest of the run
+        default_plan = self.config.default_plan
+        
+        for feature, parsed_feature_name in zip(named_features, parsed_feature_names):
+            feature_data, usage_limit = self._process_feature(feature, parsed_feature_name, plans, default_plan)
             features[parsed_feature_name] = feature_data
             if usage_limit:
                 usage_limit_name = usage_limit.pop('name')
@@ -133,7 +204,8 @@ class FeatureParser(ComponentParser):
         
         return features, usage_limits
     
-    def _process_feature(self, feature: Dict[str, Any], parsed_name: str, plans: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    def _process_feature(self, feature: Dict[str, Any], parsed_name: str, plans: Dict[str, Any],
+                         default_plan: Optional[str]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
         """Process a single feature and update plans."""
         # Process tags
         if 'tag' in feature:
@@ -141,13 +213,18 @@ class FeatureParser(ComponentParser):
         
         # Process plans
         feature_plans = feature.get('plans', {})
-        new_plans = {
-            self.names.get_plan_name(plan_key): plan_value
-            for plan_key, plan_value in feature_plans.items()
-        }
+        get_plan_name = self.names.get_plan_name
+        if all(get_plan_name(plan_key) == plan_key for plan_key in feature_plans):
+            # Keys are already normalized plan names; the dict is discarded afterwards, so reuse it
+            new_plans = feature_plans
+        else:
+            new_plans = {
+                get_plan_name(plan_key): plan_value
+                for plan_key, plan_value in feature_plans.items()
+            }
         # Set default value
-        if self.config.default_plan and self.config.default_plan in new_plans:
-            feature['defaultValue'] = new_plans[self.config.default_plan]
+        if default_plan and default_plan in new_plans:
+            feature['defaultValue'] = new_plans[default_plan]
         else:
             first_plan = next(iter(new_plans), None)
             feature['defaultValue'] = new_plans.get(first_plan)
@@ -157,7 +234,7 @@ class FeatureParser(ComponentParser):
         # Process usage limits
         usage_limit = None
         if 'limit' in feature:
-            usage_limit = self._process_usage_limit(feature, plans)
+            usage_limit = self._process_usage_limit(feature, plans, default_plan)
         
         feature.pop('plans', None)
         return feature, usage_limit
@@ -169,13 +246,16 @@ class FeatureParser(ComponentParser):
         
         for plan_name, plan_value in feature_plans.items():
             if plan_value != default_value:
-                if 'features' not in plans[plan_name] or plans[plan_name]['features'] is None:
-                    plans[plan_name]['features'] = {}
-                plans[plan_name]['features'][feature_name] = {
-                    'value': plan_value if plan_value != ".inf" else float("inf")
+                plan = plans[plan_name]
+                plan_features = plan.get('features')
+                if plan_features is None:
+                    plan_features = plan['features'] = {}
+                plan_features[feature_name] = {
+                    'value': _normalize_inf(plan_value)
                 }
     
-    def _process_usage_limit(self, feature: Dict[str, Any], plans: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_usage_limit(self, feature: Dict[str, Any], plans: Dict[str, Any],
+                             default_plan: Optional[str]) -> Dict[str, Any]:
         """Process usage limit for a feature."""
         limit = feature.pop('limit', {})
         if not limit:
@@ -199,23 +279,18 @@ class FeatureParser(ComponentParser):
         usage_limit['name'] = parsed_limit_name
         usage_limit.update(limit)
         
-        if self.config.default_plan and self.config.default_plan in usage_limit['plans']:
-            usage_limit['defaultValue'] = usage_limit['plans'][self.config.default_plan]['limitValue']
+        if default_plan and default_plan in usage_limit['plans']:
+            usage_limit['defaultValue'] = usage_limit['plans'][default_plan]['limitValue']
         else:
             first_plan = next(iter(usage_limit['plans']), None)
             usage_limit['defaultValue'] = usage_limit['plans'][first_plan]['limitValue']
             
         self._update_plans_with_usage_limit(parsed_limit_name, limit, plans, usage_limit['defaultValue'])
         
-        if usage_limit['defaultValue'] == ".inf":
-            usage_limit['defaultValue'] = float("inf")
-            
-        new_linked_features = []
-        for linked_feature in usage_limit['linkedFeatures']:
-            parsed_linked_feature = self.names.get_feature_name(linked_feature)
-            new_linked_features.append(parsed_linked_feature)
+        usage_limit['defaultValue'] = _normalize_inf(usage_limit['defaultValue'])
             
-        usage_limit['linkedFeatures'] = new_linked_features
+        get_feature_name = self.names.get_feature_name
+        usage_limit['linkedFeatures'] = [get_feature_name(linked_feature) for linked_feature in usage_limit['linkedFeatures']]
         usage_limit.pop('plans', None)
         
         return usage_limit
@@ -224,16 +299,20 @@ class FeatureParser(ComponentParser):
                                      plans: Dict[str, Any], limit_default_value: str) -> None:
         """Update plans with usage limit values."""
         limit_plans = limit.get('plans', {})
+        get_plan_name = self.names.get_plan_name
         
         for plan_name, plan_data in limit_plans.items():
-            new_plan_name = self.names.get_plan_name(plan_name)
+            new_plan_name = get_plan_name(plan_name)
             if plan_data:
-                if plan_data.get('limitValue') == limit_default_value:
+                limit_value = plan_data.get('limitValue')
+                if limit_value == limit_default_value:
                     continue
-                if 'usageLimits' not in plans[new_plan_name] or plans[new_plan_name]['usageLimits'] is None:
-                    plans[new_plan_name]['usageLimits'] = {}
-                plans[new_plan_name]['usageLimits'][limit_name] = {
-                    'limitValue': plan_data.get('limitValue') if plan_data.get('limitValue') != ".inf" else float("inf")
+                plan = plans[new_plan_name]
+                plan_limits = plan.get('usageLimits')
+                if plan_limits is None:
+                    plan_limits = plan['usageLimits'] = {}
+                plan_limits[limit_name] = {
+                    'limitValue': _normalize_inf(limit_value)
                 }
 
 class AddOnParser(ComponentParser):
@@ -299,15 +378,16 @@ class AddOnParser(ComponentParser):
                 if not limit_name:
                     continue
 
-                # 2) everything else in `item` is the content
-                content = item.copy()  # {'limitValueType':..., 'limitValue':..., ...}
+                # 2) everything else in `item` is the content; like the rest of the
+                #    parser, the raw add-on data is consumed and reshaped in place
+                content = item  # {'limitValueType':..., 'limitValue':..., ...}
 
                 # 3) pull off the extend flag
                 extend_flag = content.pop('extendPreviousOne', False)
 
                 # 4) normalize the numeric value
                 value = content.pop('limitValue', None)
-                content['value'] = float('inf') if value == '.inf' else value
+                content['value'] = _normalize_inf(value)
 
                 # 5) drop unused fields
                 content.pop('limitValueType', None)
@@ -346,18 +426,18 @@ class YAMLSerializer:
     @staticmethod
     def serialize(data: Dict[str, Any]) -> str:
         """Serialize a dictionary to YAML format."""
-        return yaml.dump(data, default_flow_style=False, sort_keys=False)
+        return yaml.dump(data, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
     
     @staticmethod
     def deserialize(yaml_str: str) -> Dict[str, Any]:
         """Deserialize a YAML string to a dictionary."""
-        return yaml.safe_load(yaml_str)
+        return yaml.load(yaml_str, Loader=SafeLoader)
     
     @staticmethod
     def validate_yaml(yaml_str: str) -> bool:
         """Validate YAML string."""
         try:
-            yaml.safe_load(yaml_str)
+            yaml.load(yaml_str, Loader=SafeLoader)
             return True
         except yaml.YAMLError:
             return False
@@ -1,33 +1,98 @@
 import csv
+import operator
 import threading
+import weakref
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, List
 
 class CSVLogger:
     """
     Thread-safe CSV logger for appending rows with header management.
+    Keeps the file open in append mode and reuses a single writer across calls.
     """
-    _locks = {}
+    # One lock per resolved file path, shared by every logger writing to it while any is alive.
+    _locks = weakref.WeakValueDictionary()
+    _registry_lock = threading.Lock()
 
-    def __init__(self, filepath: str, fieldnames: List[str]):
+    def __init__(self, filepath: str, fieldnames: List[str], flush_every: int = 1):
         self.filepath = Path(filepath)
         self.fieldnames = fieldnames
+        self._getter = operator.itemgetter(*fieldnames)
+        self._fieldname_set = frozenset(fieldnames)
+        self.flush_every = max(1, flush_every)
+        self._pending = 0
         self._ensure_dir()
-        if filepath not in CSVLogger._locks:
-            CSVLogger._locks[filepath] = threading.Lock()
-        self._lock = CSVLogger._locks[filepath]
-        self._ensure_header()
+        key = str(self.filepath.resolve())
+        with CSVLogger._registry_lock:
+            lock = CSVLogger._locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                CSVLogger._locks[key] = lock
+        self._lock = lock
+        self._fh = None
+        self._writer = None
+        self._open()
 
     def _ensure_dir(self):
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    def _ensure_header(self):
-        if not self.filepath.exists() or self.filepath.stat().st_size == 0:
-            with self._lock, open(self.filepath, mode='w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames, delimiter=';')
-                writer.writeheader()
+    def _open(self):
+        with self._lock:
+            self._fh = open(self.filepath, mode='a', newline='', encoding='utf-8', buffering=8192)
+            self._writer = csv.writer(self._fh, delimiter=';')
+            # Append mode positions at the end of the file, so an empty file has no header yet
+            if self._fh.tell() == 0:
+                self._writer.writerow(self.fieldnames)
+                self._fh.flush()
+
+    def _row_values(self, row: Dict) -> tuple:
+        """
+        Order a row's values by fieldnames. As with DictWriter, missing fields are written empty
+        and keys that are not fieldnames raise ValueError.
+        """
+        if len(row) == len(self.fieldnames):
+            # Same size and every fieldname present means there are no unknown keys
+            try:
+                values = self._getter(row)
+                return values if len(self.fieldnames) > 1 else (values,)
+            except KeyError:
+                pass
+        wrong_fields = row.keys() - self._fieldname_set
+        if wrong_fields:
+            raise ValueError("dict contains fields not in fieldnames: " + ", ".join([repr(x) for x in wrong_fields]))
+        return tuple(row.get(field, '') for field in self.fieldnames)
 
     def log(self, row: Dict):
-        with self._lock, open(self.filepath, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames, delimiter=';')
-            writer.writerow(row) 
\ No newline at end of file
+        values = self._row_values(row)
+        with self._lock:
+            self._writer.writerow(values)
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._fh.flush()
+                self._pending = 0
+
+    def log_many(self, rows: Iterable[Dict]):
+        """Append several rows under a single lock acquisition and flush once."""
+        values = [self._row_values(row) for row in rows]
+        with self._lock:
+            self._writer.writerows(values)
+            self._fh.flush()
+            self._pending = 0
+
+    def flush(self):
+        with self._lock:
+            if self._fh and not self._fh.closed:
+                self._fh.flush()
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            if self._fh and not self._fh.closed:
+                self._fh.close()
+
+    def __del__(self):
+        # Best-effort close; __del__ can run during interpreter shutdown.
+        try:
+            self.close()
+        except Exception:
+            pass
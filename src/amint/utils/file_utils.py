@@ -0,0 +1,21 @@
+"""
+Cached text file reading for A-MINT.
+Prompt templates and the Pricing2YAML specification do not change while the service runs, so each is read once per process.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Union
+
+__all__ = ["read_text_once"]
+
+@lru_cache(maxsize=None)
+def _read_resolved_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+def read_text_once(path: Union[str, Path]) -> str:
+    """
+    Return the content of a UTF-8 text file, reading it only on the first call for that file.
+    Raises the same OSError as open() when the file cannot be read; failures are not cached.
+    """
+    return _read_resolved_text(Path(path).resolve())
@@ -0,0 +1,34 @@
+"""
+YAML loader and dumper selection for A-MINT.
+Uses the libyaml C bindings when PyYAML was built with them, falling back to the pure-Python classes.
+"""
+import os
+from functools import lru_cache
+from typing import Any
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+__all__ = ["SafeLoader", "SafeDumper", "load_yaml_file", "clear_yaml_file_cache"]
+
+@lru_cache(maxsize=64)
+def _load_yaml_file_version(path: str, mtime_ns: int, size: int) -> Any:
+    """Parse one version of a YAML file; modification time and size identify the version."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return yaml.load(file, Loader=SafeLoader)
+
+def load_yaml_file(path: str) -> Any:
+    """
+    Parse a YAML file, reusing the parse while the file is unchanged.
+    The returned object is shared between callers and must not be mutated.
+    """
+    stat = os.stat(path)
+    return _load_yaml_file_version(path, stat.st_mtime_ns, stat.st_size)
+
+def clear_yaml_file_cache() -> None:
+    """Forget cached parses; writers call this since a rewrite within the same mtime tick can keep the same key."""
+    _load_yaml_file_version.cache_clear()
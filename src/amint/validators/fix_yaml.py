@@ -1,14 +1,66 @@
 import os
 import json
+import hashlib
+import threading
 import yaml
 import requests
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from typing import Optional, Dict, Any
 from ..ai.base import AIConfig
+from ..utils.file_utils import read_text_once
+from ..utils.yaml_utils import SafeLoader, SafeDumper, clear_yaml_file_cache
 import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
 
 NO_SPECIFIC_ERROR_DETAILS = "No specific error details provided."
+VALIDATION_TIMEOUT_SECONDS = 900
+# Delay before re-polling a pending job; it grows while the status stays the same and resets when it changes
+POLL_INITIAL_DELAY_SECONDS = 0.05
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY_SECONDS = 2.0
+# Validator job statuses that mean the result is not ready yet
+_PENDING_STATES = frozenset(("PENDING", "RUNNING"))
+# Number of recent file versions whose JSON rendering is kept by parse_file_as_json
+PARSE_CACHE_SIZE = 5
+# Number of recent AI fixes kept for reuse when the exact same fix prompt comes up again
+FIX_CACHE_SIZE = 16
+_INFINITY_STRINGS = frozenset(("Infinity", ".inf"))
+
+class _InfinityKey(str):
+    """A mapping key spelled like infinity, which stays a string when dumped."""
+
+class _InfinityDumper(SafeDumper):
+    """
+    Safe dumper that writes the "Infinity" and ".inf" strings produced by the LLM as YAML infinity.
+    Only values are rewritten; mapping keys keep their string form.
+    """
+
+    def represent_dict(self, data: dict) -> yaml.Node:
+        if _INFINITY_STRINGS.isdisjoint(data):
+            return super().represent_dict(data)
+        items = [(_InfinityKey(key) if type(key) is str and key in _INFINITY_STRINGS else key, value)
+                 for key, value in data.items()]
+        if self.sort_keys:
+            items.sort()
+        return self.represent_mapping("tag:yaml.org,2002:map", items)
+
+def _represent_str(dumper: SafeDumper, data: str) -> yaml.Node:
+    if data in _INFINITY_STRINGS:
+        return dumper.represent_float(float("inf"))
+    return dumper.represent_str(data)
+
+def _represent_infinity_key(dumper: SafeDumper, data: _InfinityKey) -> yaml.Node:
+    # The libyaml emitter only accepts exact str scalar values
+    return dumper.represent_str(str(data))
+
+_InfinityDumper.add_representer(str, _represent_str)
+_InfinityDumper.add_representer(_InfinityKey, _represent_infinity_key)
+_InfinityDumper.add_representer(dict, _InfinityDumper.represent_dict)
 
 class CSPEndpointError(Exception):
     """Exception raised for errors related to CSP endpoints."""
@@ -19,6 +71,10 @@ class FixYaml:
     Handles YAML validation and automated fixes via the OpenAI-compatible API and a CSP Validator endpoint.
     Modular, decoupled, and aligned with the codebase's best practices.
     """
+    # Valid AI fixes keyed by a digest of the prompt that produced them, shared across instances
+    _fix_cache: "OrderedDict[bytes, str]" = OrderedDict()
+    _fix_cache_lock = threading.Lock()
+
     def __init__(
         self,
         file_path: str,
@@ -34,6 +90,7 @@ class FixYaml:
     ):
         self.is_valid = False
         self.file_path = file_path
+        self._parse_cache: Dict[tuple, str] = {}
         self.validator_endpoint = os.getenv('ANALYSIS_API', "http://localhost:8002/api/v1")
         if not self.validator_endpoint:
             raise ValueError('YAML Validator Endpoint not found!')
@@ -53,21 +110,30 @@ class FixYaml:
             elif url:
                 self.html = self._get_html(url)
         self.pricing2yaml_specification = self._load_specification()
-        result_cycle = self._fix_cycle()
+        self._static_prompt_kwargs = self._build_static_prompt_kwargs()
+        # One pooled session keeps the connection to the validator alive across submissions and polls
+        self._http = self._create_http_session()
+        try:
+            result_cycle = self._fix_cycle()
+        finally:
+            self._http.close()
         if result_cycle:
             self.is_valid = True
 
+    def _create_http_session(self) -> requests.Session:
+        """Creates the session used for validator requests, retrying idempotent calls on gateway errors."""
+        session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _load_prompts(self) -> Dict[str, str]:
-        prompts = {}
-        for prompt_file in self.prompts_dir.glob("*.md"):
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                prompts[prompt_file.stem] = f.read()
-        return prompts
+        return {prompt_file.stem: read_text_once(prompt_file) for prompt_file in self.prompts_dir.glob("*.md")}
 
     def _load_specification(self) -> str:
-        spec_path = Path("src/amint/prompts/pricing2YamlSpecification.md")
-        with open(spec_path, 'r', encoding='utf-8') as file:
-            return file.read().strip()
+        return read_text_once(Path("src/amint/prompts/pricing2YamlSpecification.md")).strip()
 
     def _fix_cycle(self):
         # The initial validation outside the loop is removed.
@@ -75,7 +141,7 @@ class FixYaml:
 
         while not self.finish:
             if self.counter >= self.max_retries:
-                logging.error("Exceeded maximum number of retries.")
+                logger.error("Exceeded maximum number of retries.")
                 self.finish = True
                 return False  # Exit if max retries reached
 
@@ -87,7 +153,7 @@ class FixYaml:
                 # This implies that local YAML parsing failed, 
                 # _ensure_valid_local_yaml called AI, but the AI's fix was also invalid,
                 # or another error occurred during the local fix attempt.
-                logging.error("Local YAML parsing and AI-assisted fix failed. Cannot proceed with validation.")
+                logger.error("Local YAML parsing and AI-assisted fix failed. Cannot proceed with validation.")
                 # Raising ValueError as in the original logic for unrecoverable local file state.
                 raise ValueError("Unable to fix local YAML parsing error automatically, even with AI assist for local parsing.")
 
@@ -95,42 +161,46 @@ class FixYaml:
             # self.validate() reads from self.file_path, which _ensure_valid_local_yaml might have updated.
             response = self.validate() 
             response_json = response.json()
-            logging.info(f"Validation attempt {self.counter + 1}/{self.max_retries} - Status: {response.status_code}, valid: {response_json.get('result').get('valid')}")
-            if response_json.get('result').get('valid') == False and response_json.get('result').get('error') == "Request failed with status code 500":
-                logging.error("Validation failed with a 500 error. This might indicate a server-side issue. Retrying with 'minizinc' solver.")
+            result = response_json.get('result')
+            logger.info("Validation attempt %s/%s - Status: %s, valid: %s", self.counter + 1, self.max_retries, response.status_code, result.get('valid'))
+            if result.get('valid') == False and result.get('error') == "Request failed with status code 500":
+                logger.error("Validation failed with a 500 error. This might indicate a server-side issue. Retrying with 'minizinc' solver.")
                 response = self.validate('minizinc')
                 response_json = response.json()
-                logging.info(f"Validation attempt {self.counter + 1}/{self.max_retries} - Status: {response.status_code}, valid: {response_json.get('result').get('valid')}")
+                result = response_json.get('result')
+                logger.info("Validation attempt %s/%s - Status: %s, valid: %s", self.counter + 1, self.max_retries, response.status_code, result.get('valid'))
 
-            if response.status_code == 200 and response_json.get('result').get('valid') == True:
+            if response.status_code == 200 and result.get('valid') == True:
                 self.finish = True
-                logging.info("Validation successful. The YAML file is valid.")
+                logger.info("Validation successful. The YAML file is valid.")
                 return True  # Exit if validation is successful
             
             # Step 3: If validation fails (either non-200 status or a non-SUCCESS messageType),
             # log the error and call AI to fix based on the validator's feedback.
             # current_json_content_after_local_check is the JSON string representation
             # of the file content that was just validated.
-            logging.info(f"Validation failed with errors: {str(response_json.get('result').get('error'))}")
+            logger.info("Validation failed with errors: %s", result.get('error'))
             self._handle_validator_error(response_json, current_json_content_after_local_check) 
             
             self.counter += 1
 
     def validate(self, solver='choco') -> requests.Response:
         with open(self.file_path, 'rb') as file_handle:
-            logging.info(f"Validating file: {self.file_path}")
-            first_response = requests.post(f"{self.validator_endpoint}/pricing/analysis", files={'pricingFile': file_handle}, data={'operation': 'validate', 'solver': solver})
-            logging.info(f"Initial validation response status: {first_response.status_code}")
+            logger.info("Validating file: %s", self.file_path)
+            first_response = self._http.post(f"{self.validator_endpoint}/pricing/analysis", files={'pricingFile': file_handle}, data={'operation': 'validate', 'solver': solver})
+            logger.info("Initial validation response status: %s", first_response.status_code)
             try:
-                logging.info(f"Initial validation response JSON: {first_response.json()}")
+                first_body = first_response.json()
             except requests.exceptions.JSONDecodeError:
-                logging.info("Initial validation response not JSON.")
-            job_id = first_response.json().get('jobId')
+                logger.info("Initial validation response not JSON.")
+                raise
+            logger.info("Initial validation response JSON: %s", first_body)
+            job_id = first_body.get('jobId')
             
             if first_response.status_code != 202 or not job_id:
-                logging.error(f"Initial validation failed with status {first_response.status_code} and no job_id.")
-                if error_message := first_response.json().get('error'):
-                    logging.error(f"Error message from validation: {error_message}")
+                logger.error("Initial validation failed with status %s and no job_id.", first_response.status_code)
+                if error_message := first_body.get('error'):
+                    logger.error("Error message from validation: %s", error_message)
                     # Return a mock response-like object with the error details
                     class MockResponse:
                         def __init__(self, status_code, error_message):
@@ -149,27 +219,39 @@ class FixYaml:
                             return self._status_code
                     return MockResponse(first_response.status_code, error_message)
 
-            # Step 2: Poll for validation result
-            logging.info(f"Polling for validation result with job_id: {job_id}")
-            second_response = requests.get(f"{self.validator_endpoint}/pricing/analysis/{job_id}")
-            logging.info(f"Validation response status: {second_response.status_code}")
+            # Step 2: Poll for validation result, backing off while the job is pending
+            logger.info("Polling for validation result with job_id: %s", job_id)
+            poll_url = f"{self.validator_endpoint}/pricing/analysis/{job_id}"
+            second_response = self._http.get(poll_url)
+            logger.info("Validation response status: %s", second_response.status_code)
             try:
-                logging.info(f"Validation response JSON: {second_response.json()}")
-                start_time = time.time()
-                while second_response.json().get('status') == 'PENDING' or second_response.json().get('status') == 'RUNNING':
-                    elapsed_time = time.time() - start_time
-                    if elapsed_time > 900:  # Timeout after 900 seconds
-                        logging.error("Validation timed out after 900 seconds.")
+                body = second_response.json()
+                logger.info("Validation response JSON: %s", body)
+                start_time = time.monotonic()
+                delay = POLL_INITIAL_DELAY_SECONDS
+                status = body.get('status')
+                while status in _PENDING_STATES:
+                    elapsed_time = time.monotonic() - start_time
+                    if elapsed_time > VALIDATION_TIMEOUT_SECONDS:
+                        logger.error("Validation timed out after %s seconds.", VALIDATION_TIMEOUT_SECONDS)
                         raise TimeoutError("Validation timed out.")
-                    logging.info("Validation is still pending, waiting for result...")
-                    second_response = requests.get(f"{self.validator_endpoint}/pricing/analysis/{job_id}")
-                    logging.info(f"Polling response status: {second_response.status_code} - {elapsed_time:.2f} seconds elapsed")
+                    logger.debug("Validation is still pending, waiting for result...")
+                    time.sleep(delay)
+                    second_response = self._http.get(poll_url)
+                    logger.debug("Polling response status: %s - %.2f seconds elapsed", second_response.status_code, elapsed_time)
                     try:
-                        logging.info(f"Polling response JSON: {second_response.json()}")
+                        body = second_response.json()
+                        logger.debug("Polling response JSON: %s", body)
                     except requests.exceptions.JSONDecodeError:
-                        logging.info("Polling response not JSON.")
+                        logger.info("Polling response not JSON.")
+                        break
+                    previous_status, status = status, body.get('status')
+                    if status != previous_status:
+                        delay = POLL_INITIAL_DELAY_SECONDS
+                    else:
+                        delay = min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY_SECONDS)
             except requests.exceptions.JSONDecodeError:
-                logging.info("Validation response not JSON.")
+                logger.info("Validation response not JSON.")
         return second_response
 
     # def _prettify_html_content(self, html_data: Dict[str, Any]) -> str:
@@ -214,18 +296,23 @@ class FixYaml:
     def _get_html(self, url: str) -> Optional[str]: # Mark url as unused if not implemented
         # Placeholder for HTML extraction logic, can be integrated with WebDriver if needed
         # If url is truly unused for now, consider removing it or prefixing with _
-        logging.info(f"HTML extraction from URL ({url}) is not yet implemented.")
+        logger.info("HTML extraction from URL (%s) is not yet implemented.", url)
         return None
 
     def _ensure_valid_local_yaml(self) -> Optional[str]:
         """Ensures the YAML file is locally parsable, attempting AI fix if not."""
+        raw_content = None
         try:
-            json_string = self.parse_file_as_json()
-            logging.info("Local YAML is already valid.")
+            # Same steps as parse_file_as_json, keeping the text read so a parse error can reuse it
+            cache_key = self._file_cache_key()
+            json_string = self._parse_cache.get(cache_key)
+            if json_string is None:
+                raw_content = self._read_file_content()
+                json_string = self._load_yaml_as_json(raw_content, cache_key)
+            logger.info("Local YAML is already valid.")
             return json_string
         except yaml.YAMLError as e: # Catch specific YAML parsing errors
-            logging.warning(f"Local YAML parsing error: {e}. Attempting AI fix.")
-            raw_content = self._read_file_content()
+            logger.warning("Local YAML parsing error: %s. Attempting AI fix.", e)
             prompt = self._build_prompt(
                 prompt_type="general",
                 error_overview="YAML reader encountered an error locally during parsing.",
@@ -241,15 +328,15 @@ class FixYaml:
                 json_output=False
             )
             try:
-                json.loads(fixed_json_suggestion) # Check if AI returned valid JSON
+                # parse_json_as_yaml raises JSONDecodeError if the AI did not return valid JSON
                 self.parse_json_as_yaml(fixed_json_suggestion)
-                logging.info("AI successfully fixed local YAML parsing error.")
+                logger.info("AI successfully fixed local YAML parsing error.")
                 return fixed_json_suggestion
             except (json.JSONDecodeError, yaml.YAMLError) as fix_e: # More specific exceptions
-                logging.error(f"AI fix for local YAML parsing failed: {fix_e}. Raw AI output: {fixed_json_suggestion}")
+                logger.error("AI fix for local YAML parsing failed: %s. Raw AI output: %s", fix_e, fixed_json_suggestion)
                 return None
         except Exception as e: # Catch any other unexpected error during local parsing/reading
-            logging.error(f"Unexpected error in _ensure_valid_local_yaml: {e}")
+            logger.error("Unexpected error in _ensure_valid_local_yaml: %s", e)
             return None
 
 
@@ -270,43 +357,82 @@ class FixYaml:
     def _handle_validator_error(self, response_json: dict, json_content: str) -> None:
         errors = response_json.get('result', {}).get('error', '')
 
-        logging.info("Handling validator error.")
+        logger.info("Handling validator error.")
 
         prompt, function_name = self._build_error_prompt_for_ai(
             errors, json_content
         )
         
-        fixed_json_suggestion = self.ai_client.make_full_request(
-            prompt,
-            endpoint=self.endpoint or "FixYaml",
-            function=function_name,
-            transformation_call_id=self.transformation_call_id,
-            llm_call_ids=self.llm_call_ids,
-            json_output=False
-        )
+        # The prompt covers the content, the error and the context, so an identical prompt
+        # can reuse the earlier fix. Each cached fix is handed out once: if the same prompt
+        # comes back after that, the fix did not help and the LLM is asked again.
+        cache_key = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+        with FixYaml._fix_cache_lock:
+            fixed_json_suggestion = FixYaml._fix_cache.pop(cache_key, None)
+        reused_fix = fixed_json_suggestion is not None
+        if reused_fix:
+            logger.info("Reusing the previous AI fix for an identical validation error.")
+        else:
+            fixed_json_suggestion = self.ai_client.make_full_request(
+                prompt,
+                endpoint=self.endpoint or "FixYaml",
+                function=function_name,
+                transformation_call_id=self.transformation_call_id,
+                llm_call_ids=self.llm_call_ids,
+                json_output=False
+            )
 
         try:
-            json.loads(fixed_json_suggestion)
             self.parse_json_as_yaml(fixed_json_suggestion)
-            logging.info(f"AI attempt to fix {errors} applied. Raw AI output was written to file.")
+            logger.info("AI attempt to fix %s applied. Raw AI output was written to file.", errors)
+            if not reused_fix:
+                self._remember_fix(cache_key, fixed_json_suggestion)
         except (json.JSONDecodeError, yaml.YAMLError) as ai_fix_error: # More specific exceptions
-            logging.error(f"AI's suggested fix for {errors} was invalid: {ai_fix_error}. AI Output: {fixed_json_suggestion}")
+            logger.error("AI's suggested fix for %s was invalid: %s. AI Output: %s", errors, ai_fix_error, fixed_json_suggestion)
 
-    def _build_prompt(self, prompt_type: str, **kwargs) -> str:
+    def _build_static_prompt_kwargs(self) -> Dict[str, str]:
+        """Builds the prompt values that stay fixed for the lifetime of this instance."""
         html_context = f"Finally, here is the original markdown content obtained from the HTML webpage that was used to generate the Pricing2Yaml JSON. Please, remember, you may need to fix errors that present multiple possible solutions—ensure that your changes always align with the pricing displayed in the markdown:\n<webpage_content>\n{self.html}\n</webpage_context>" if self.html else ""
         html_resolution_hint = "You must resolve errors with multiple possible solution paths by choosing the one that best aligns with the pricing displayed in the Markdown." if self.html else ""
-        base_kwargs = dict(pricing2yaml_specification=self.pricing2yaml_specification, html_context=html_context, html_resolution_hint=html_resolution_hint)
-        kwargs.update(base_kwargs)
+        return dict(pricing2yaml_specification=self.pricing2yaml_specification, html_context=html_context, html_resolution_hint=html_resolution_hint)
+
+    def _remember_fix(self, cache_key: bytes, fixed_json: str) -> None:
+        """Stores an applied fix, evicting the least recently stored one when the cache is full."""
+        with FixYaml._fix_cache_lock:
+            FixYaml._fix_cache[cache_key] = fixed_json
+            if len(FixYaml._fix_cache) > FIX_CACHE_SIZE:
+                FixYaml._fix_cache.popitem(last=False)
+
+    def _build_prompt(self, prompt_type: str, **kwargs) -> str:
         prompt_template = self.prompts.get(prompt_type)
         if not prompt_template:
             raise ValueError(f"Prompt template '{prompt_type}' not found.")
-        return prompt_template.format(**kwargs)
+        # Static values take precedence over caller-supplied ones, as before
+        kwargs.update(self._static_prompt_kwargs)
+        return prompt_template.format_map(kwargs)
 
     def parse_file_as_json(self) -> str:
-        """Reads the YAML file and returns its content as a JSON string."""
-        with open(self.file_path, 'r', encoding='utf-8') as file_handle:
-            yaml_content = yaml.safe_load(file_handle)
-        return json.dumps(yaml_content, indent=4)
+        """Reads the YAML file and returns its content as a JSON string, reusing it while the file is unchanged."""
+        cache_key = self._file_cache_key()
+        json_string = self._parse_cache.get(cache_key)
+        if json_string is None:
+            json_string = self._load_yaml_as_json(self._read_file_content(), cache_key)
+        return json_string
+
+    def _file_cache_key(self) -> tuple:
+        """Identifies the current version of the YAML file by path, modification time and size."""
+        stat = os.stat(self.file_path)
+        return (self.file_path, stat.st_mtime_ns, stat.st_size)
+
+    def _load_yaml_as_json(self, yaml_text: str, cache_key: tuple) -> str:
+        """Parses YAML text into a JSON string and caches it under the given file key."""
+        yaml_content = yaml.load(yaml_text, Loader=SafeLoader)
+        # Only ever embedded in LLM prompts, so skip the pretty-printing
+        json_string = json.dumps(yaml_content)
+        if len(self._parse_cache) >= PARSE_CACHE_SIZE:
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[cache_key] = json_string
+        return json_string
 
     def parse_json_as_yaml(self, json_content: str) -> None:
         """Parses a JSON string, converts to YAML, and writes to the file, handling 'Infinity'."""
@@ -314,24 +440,16 @@ class FixYaml:
             # First, load the JSON string to a Python object
             data_from_json = json.loads(json_content)
         except json.JSONDecodeError as e:
-            logging.error(f"Invalid JSON content provided to parse_json_as_yaml: {e}")
-            logging.error(f"Problematic JSON content: {json_content[:500]}...") # Log snippet
+            logger.error("Invalid JSON content provided to parse_json_as_yaml: %s", e)
+            logger.error("Problematic JSON content: %s...", json_content[:500]) # Log snippet
             raise # Re-raise the error to be handled by the caller
 
-        # Recursively replace "Infinity" string with float('inf')
-        def replace_infinity(value):
-            if isinstance(value, str) and (value == "Infinity" or value == ".inf"):
-                return float("inf")
-            elif isinstance(value, dict):
-                return {k: replace_infinity(v) for k, v in value.items()}
-            elif isinstance(value, list):
-                return [replace_infinity(item) for item in value]
-            return value
-        
-        yaml_ready_data = replace_infinity(data_from_json)
-        
+        # "Infinity" strings are written as .inf by the dumper, so the decoded data is dumped as is
         with open(self.file_path, 'w', encoding='utf-8') as file_handle:
-            yaml.dump(yaml_ready_data, file_handle, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            yaml.dump(data_from_json, file_handle, Dumper=_InfinityDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        # A rewrite within the same mtime tick could keep the same key, so drop cached renderings
+        self._parse_cache.clear()
+        clear_yaml_file_cache()
 
     def _read_file_content(self) -> str:
         """Reads and returns the raw content of the YAML file."""
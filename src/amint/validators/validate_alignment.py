@@ -1,13 +1,49 @@
 from pathlib import Path
 from typing import Optional, Dict, Any, Union, List
+from functools import lru_cache, cached_property
+import copy
 import json
 import yaml
 import logging
 import re
 from ..ai.base import AIClient
+from ..ai.llm_cache import LLMCache
+from ..utils.file_utils import read_text_once
+from ..utils.yaml_utils import SafeLoader, SafeDumper, load_yaml_file, clear_yaml_file_cache
 
 logger = logging.getLogger(__name__)
 
+SPECIFICATION_PATH = Path("src/amint/prompts/pricing2YamlSpecification.md")
+# Write buffer for the updated Pricing2YAML file, large enough to hold it in one write
+_WRITE_BUFFER_SIZE = 1 << 20
+# Runs of whitespace within a line; line breaks are kept since they carry markdown structure
+_HORIZONTAL_WHITESPACE_RE = re.compile(r"[^\S\r\n]+")
+_TRAILING_WHITESPACE_RE = re.compile(r"[^\S\r\n]+(?=[\r\n]|\Z)")
+# Stands in for the differences in the patch prompt when the comparison did not list any
+_NO_DIFFS_FALLBACK = (
+    "There are no differences provided. Please look at the generated markdown and scraped (original) markdown, "
+    "compare the following two markdown contents and determine if they are semantically equivalent in terms of "
+    "pricing information. This task is similar to a metamorphic test, where you need to ensure that the content "
+    "aligns in meaning, even if the formatting or presentation differs."
+)
+
+# Dash patterns for the default limits of _normalize_markdown_dashes
+_TABLE_DASH_RE = re.compile(r"(?P<prefix>:?)(?P<dashes>-{51,})(?P<suffix>:?)")
+_NON_TABLE_DASH_RE = re.compile(r"-{4,}")
+# The first code block of a response that opens with a fence, with an optional language tag;
+# a truncated block runs to the end of the response
+_FENCE_RE = re.compile(r"\s*```(?:yaml|json|markdown|md)?[^\S\n]*\n?(.*?)(?:```|\Z)", re.DOTALL)
+
+def _strip_code_fence(s: str) -> str:
+    """Return the first fenced block of an LLM response, or the response unchanged if it does not start with a fence."""
+    m = _FENCE_RE.match(s)
+    return m.group(1) if m else s
+
+@lru_cache(maxsize=8)
+def _table_dash_pattern(max_table_dashes: int) -> re.Pattern:
+    """Compile the table separator pattern for a non-default dash limit."""
+    return re.compile(rf"(?P<prefix>:?)(?P<dashes>-{{{max_table_dashes+1},}})(?P<suffix>:?)")
+
 class ValidateAlignment:
     """
     Validates alignment between a Pricing2YAML file and scraped markdown content.
@@ -23,7 +59,8 @@ class ValidateAlignment:
         prompts_dir: str = "src/amint/prompts/validate_alignment",
         transformation_call_id: Optional[str] = None,
         endpoint: Optional[str] = None,
-        llm_call_ids: Optional[list] = None
+        llm_call_ids: Optional[list] = None,
+        llm_cache: Optional[LLMCache] = None
     ):
         """
         Initialize the ValidateAlignment utility.
@@ -31,11 +68,13 @@ class ValidateAlignment:
         Args:
             pricing2yaml_file_path: Path to the Pricing2YAML file to validate
             scraped_markdown: Markdown content scraped from the live SaaS pricing page
-            ai_client: AI client for LLM interactions
+            ai_client: AI client for LLM interactions; share one client across instances so its
+                pooled HTTP connections are reused between validations
             prompts_dir: Directory containing prompt templates
             transformation_call_id: Optional transformation call ID for tracking
             endpoint: Optional endpoint for the AI client
             llm_call_ids: Optional list of LLM call IDs for tracking
+            llm_cache: Optional response cache, used only at temperature 0; no caching when omitted
         """
         self.pricing2yaml_file_path = pricing2yaml_file_path
         self.scraped_markdown = scraped_markdown
@@ -43,46 +82,80 @@ class ValidateAlignment:
         self.prompts_dir = Path(prompts_dir)
         self.transformation_call_id = transformation_call_id
         self.endpoint = endpoint
+        self._endpoint = endpoint or "ValidateAlignment"
         self.llm_call_ids = llm_call_ids if llm_call_ids is not None else []
+        self.llm_cache = llm_cache
         
-        # Load prompts and specification
-        self.prompts = self._load_prompts()
+        # Prompts are read on first use; load the specification
+        self._resolved_prompts_dir = self.prompts_dir.resolve()
         self.pricing2yaml_specification = self._load_specification()
         
         # Load the pricing2yaml content
         self.pricing2yaml_content = self._load_pricing2yaml_file()
         
-    def _load_prompts(self) -> Dict[str, str]:
-        """Load prompt templates from the prompts directory."""
-        prompts = {}
-        if not self.prompts_dir.exists():
-            logger.warning(f"Prompts directory not found: {self.prompts_dir}")
-            return prompts
-            
-        for prompt_file in self.prompts_dir.glob("*.md"):
-            with open(prompt_file, "r", encoding="utf-8") as f:
-                prompts[prompt_file.stem] = f.read()
-        return prompts
+    def _llm(self, prompt: str, *, function: str, json_output: bool) -> str:
+        """Send a prompt to the AI client with this instance's tracking arguments."""
+        return self.ai_client.make_full_request(
+            prompt,
+            endpoint=self._endpoint,
+            function=function,
+            transformation_call_id=self.transformation_call_id,
+            llm_call_ids=self.llm_call_ids,
+            json_output=json_output
+        )
+    
+    def _get_prompt(self, name: str) -> Optional[str]:
+        """Get a prompt template from the prompts directory by name, reading it on first use."""
+        prompt_file = self._resolved_prompts_dir / f"{name}.md"
+        try:
+            return read_text_once(prompt_file)
+        except FileNotFoundError:
+            logger.warning(f"Prompt template not found: {prompt_file}")
+            return None
     
     def _load_specification(self) -> str:
         """Load the Pricing2YAML specification."""
-        spec_path = Path("src/amint/prompts/pricing2YamlSpecification.md")
-        if not spec_path.exists():
-            logger.warning(f"Specification file not found: {spec_path}")
+        try:
+            return read_text_once(SPECIFICATION_PATH).strip()
+        except FileNotFoundError:
+            logger.warning(f"Specification file not found: {SPECIFICATION_PATH}")
             return ""
-            
-        with open(spec_path, 'r', encoding='utf-8') as file:
-            return file.read().strip()
     
     def _load_pricing2yaml_file(self) -> Dict[str, Any]:
         """Load and parse the Pricing2YAML file."""
         try:
-            with open(self.pricing2yaml_file_path, 'r', encoding='utf-8') as file:
-                return yaml.safe_load(file)
+            content = load_yaml_file(self.pricing2yaml_file_path)
+            # The cached object is shared between instances, so hand out a private copy
+            return copy.deepcopy(content)
         except Exception as e:
             logger.error(f"Failed to load Pricing2YAML file {self.pricing2yaml_file_path}: {e}")
             raise ValueError(f"Cannot load Pricing2YAML file: {e}")
     
+    @cached_property
+    def _pricing2yaml_json(self) -> str:
+        """The loaded Pricing2YAML content as indented JSON, rendered once for every prompt that embeds it."""
+        return json.dumps(self.pricing2yaml_content, indent=2)
+    
+    @cached_property
+    def _generate_ideal_markdown_parts(self) -> tuple:
+        """
+        The generate_ideal_markdown prompt rendered around its content placeholder, once per instance.
+        
+        Returns:
+            Tuple of (prefix, suffix) to concatenate around the Pricing2YAML JSON
+        """
+        prompt_template = self._get_prompt("generate_ideal_markdown")
+        prefix_template, suffix_template = prompt_template.split("{pricing2yaml_content}", 1)
+        return (
+            prefix_template.format(pricing2yaml_specification=self.pricing2yaml_specification),
+            suffix_template.format(pricing2yaml_specification=self.pricing2yaml_specification)
+        )
+    
+    def _build_generate_ideal_markdown_prompt(self, pricing2yaml_content: str) -> str:
+        """Build the generate_ideal_markdown prompt for the given Pricing2YAML JSON."""
+        prefix, suffix = self._generate_ideal_markdown_parts
+        return prefix + pricing2yaml_content + suffix
+    
     def validate(self) -> bool:
         """
         Validate the alignment of the Pricing2YAML file with the scraped markdown.
@@ -93,23 +166,16 @@ class ValidateAlignment:
         """
         try:
             logger.info("Starting alignment validation...")
-            prompt = self.prompts.get("validate_alignment")
-            if not prompt:
+            prompt_template = self._get_prompt("validate_alignment")
+            if not prompt_template:
                 logger.error("Prompt for validate_alignment not found.")
                 return False
-            prompt = prompt.format(
+            prompt = prompt_template.format(
                 pricing2yaml_specification=self.pricing2yaml_specification,
-                pricing2yaml_content=json.dumps(self.pricing2yaml_content, indent=2),
+                pricing2yaml_content=self._pricing2yaml_json,
                 scraped_markdown=self.scraped_markdown
             )
-            response = self.ai_client.make_full_request(
-                prompt,
-                endpoint=self.endpoint or "ValidateAlignment",
-                function="validate_alignment",
-                transformation_call_id=self.transformation_call_id,
-                llm_call_ids=self.llm_call_ids,
-                json_output=True
-            )
+            response = self._llm(prompt, function="validate_alignment", json_output=True)
             return response
         except Exception as e:
             logger.error(f"Error during alignment validation: {e}")
@@ -130,8 +196,11 @@ class ValidateAlignment:
             
             ideal_markdown = self._normalize_markdown_dashes(ideal_markdown)
             
-            # Step 2: Compare ideal markdown with scraped markdown
-            comparison = self._compare_markdown_content(ideal_markdown, self.scraped_markdown)
+            # Step 2: Compare ideal markdown with scraped markdown, skipping the LLM when they are identical
+            if self._is_trivially_aligned(ideal_markdown, self.scraped_markdown):
+                comparison = {"aligned": True, "confidence": 1.0, "differences": []}
+            else:
+                comparison = self._compare_markdown_content(ideal_markdown, self.scraped_markdown)
             
             logging.info("Comparison result: " + json.dumps(comparison, indent=2))
             
@@ -172,32 +241,24 @@ class ValidateAlignment:
         Returns:
             Generated markdown content
         """
-        prompt_template = self.prompts.get("generate_ideal_markdown")
+        prompt = self._build_generate_ideal_markdown_prompt(self._pricing2yaml_json)
         
-        prompt = prompt_template.format(
-            pricing2yaml_specification=self.pricing2yaml_specification,
-            pricing2yaml_content=json.dumps(self.pricing2yaml_content, indent=2)
-        )
-        
-        response = self.ai_client.make_full_request(
-            prompt,
-            endpoint=self.endpoint or "ValidateAlignment",
-            function="generate_ideal_markdown",
-            transformation_call_id=self.transformation_call_id,
-            llm_call_ids=self.llm_call_ids,
-            json_output=False
-        )
+        response = self._llm(prompt, function="generate_ideal_markdown", json_output=False)
         
         # Remove markdown code blocks if present
-        if response.startswith('```'):
-            response = response.split('```')[1]
-            
-        if response.endswith('```'):
-            response = response[:-3]
-            
+        response = _strip_code_fence(response)
         
         return response.strip()
     
+    def _is_trivially_aligned(self, ideal_markdown: str, scraped_markdown: str) -> bool:
+        """
+        Check whether the contents are aligned without calling the LLM.
+        
+        Only identical lowercased word sequences are conclusive; similarity scores are not, since
+        reordered values or extra page text can push them either way.
+        """
+        return ideal_markdown.lower().split() == scraped_markdown.lower().split()
+    
     def _compare_markdown_content(self, ideal_markdown: str, scraped_markdown: str) -> bool:
         """
         Compare ideal markdown with scraped markdown to determine alignment.
@@ -209,32 +270,71 @@ class ValidateAlignment:
         Returns:
             True if content is semantically aligned, False otherwise
         """
-        prompt_template = self.prompts.get("compare_markdown")
+        prompt_template = self._get_prompt("compare_markdown")
         if not prompt_template:
             # Fallback prompt if template not found
             prompt_template = self._get_fallback_compare_markdown_prompt()
         
-        prompt = prompt_template.format(
-            ideal_markdown=ideal_markdown,
-            scraped_markdown=scraped_markdown
-        )
-        
-        response = self.ai_client.make_full_request(
-            prompt,
-            endpoint=self.endpoint or "ValidateAlignment",
-            function="compare_markdown_content",
-            transformation_call_id=self.transformation_call_id,
-            llm_call_ids=self.llm_call_ids,
-            json_output=True
+        cache_key = self._response_cache_key(
+            "compare_markdown_content",
+            template=prompt_template,
+            ideal_markdown=self._canonicalize_markdown(ideal_markdown),
+            scraped_markdown=self._canonicalize_markdown(scraped_markdown)
         )
+        response = self._get_cached_response(cache_key)
+        from_cache = response is not None
+        if not from_cache:
+            prompt = prompt_template.format(
+                ideal_markdown=ideal_markdown,
+                scraped_markdown=scraped_markdown
+            )
+            
+            response = self._llm(prompt, function="compare_markdown_content", json_output=True)
         
         try:
             result = json.loads(response)
-            return result
         except json.JSONDecodeError:
             logger.error(f"Failed to parse comparison result: {response}")
             return False
+        
+        # Cache only replies that parsed, so a malformed one is retried next time
+        if not from_cache:
+            self._store_cached_response(cache_key, response)
+        return result
 
+    def _response_cache_key(self, function: str, **inputs: Any) -> Optional[str]:
+        """
+        Build the response cache key for an LLM call.
+        
+        Returns None when responses must not be cached, i.e. when no cache was given or
+        sampling is not deterministic.
+        """
+        if self.llm_cache is None:
+            return None
+        config = getattr(self.ai_client, "config", None)
+        if config is None or config.temperature != 0:
+            return None
+        return LLMCache.make_key(function=function, model=config.model, **inputs)
+    
+    def _get_cached_response(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return a cached LLM response, if caching applies and one is stored."""
+        if cache_key is None:
+            return None
+        response = self.llm_cache.get(cache_key)
+        if response is not None:
+            logger.info(f"Using cached LLM response {cache_key[:12]}")
+        return response
+    
+    def _store_cached_response(self, cache_key: Optional[str], response: str) -> None:
+        """Store an LLM response when caching applies."""
+        if cache_key is not None and response:
+            self.llm_cache.set(cache_key, response)
+    
+    def _canonicalize_markdown(self, md_text: str) -> str:
+        """Normalize markdown for cache keys: clamp dash runs, drop trailing spaces and collapse whitespace within lines."""
+        md_text = _TRAILING_WHITESPACE_RE.sub("", self._normalize_markdown_dashes(md_text))
+        return _HORIZONTAL_WHITESPACE_RE.sub(" ", md_text)
+    
     def _patch_pricing2yaml_file(self, ideal_markdown: str, differences: List[str]) -> Dict[str, str]:
         """
         Patch the Pricing2YAML file to align with scraped markdown.
@@ -245,24 +345,17 @@ class ValidateAlignment:
         Returns:
             Dictionary with updated YAML and regenerated markdown
         """
-        prompt_template = self.prompts.get("patch_pricing2yaml")
+        prompt_template = self._get_prompt("patch_pricing2yaml")
         
         prompt = prompt_template.format(
             pricing2yaml_specification=self.pricing2yaml_specification,
-            current_pricing2yaml=json.dumps(self.pricing2yaml_content, indent=2),
+            current_pricing2yaml=self._pricing2yaml_json,
             ideal_markdown=ideal_markdown,
             scraped_markdown=self.scraped_markdown,
-            differences=json.dumps(differences, indent=2) if differences else "There are no differences provided. Please look at the generated markdown and scraped (original) markdown, compare the following two markdown contents and determine if they are semantically equivalent in terms of pricing information. This task is similar to a metamorphic test, where you need to ensure that the content aligns in meaning, even if the formatting or presentation differs."
+            differences=json.dumps(differences, indent=2) if differences else _NO_DIFFS_FALLBACK
         )
         
-        response = self.ai_client.make_full_request(
-            prompt,
-            endpoint=self.endpoint or "ValidateAlignment",
-            function="patch_pricing2yaml_file",
-            transformation_call_id=self.transformation_call_id,
-            llm_call_ids=self.llm_call_ids,
-            json_output=True
-        )
+        response = self._llm(prompt, function="patch_pricing2yaml_file", json_output=True)
         
         logger.info(f"Patch response: {response}")
         
@@ -294,28 +387,30 @@ class ValidateAlignment:
         try:
             if isinstance(yaml_content, str):
                 # If it's a string, try to parse it as JSON first, then convert to YAML
-                if yaml_content.startswith('```yaml') and yaml_content.endswith('```'):
-                    yaml_content = yaml_content.split('```yaml')[1].strip()
-                    yaml_content = yaml_content[:-3].strip()
-                elif yaml_content.startswith('```json') and yaml_content.endswith('```'):
-                    yaml_content = yaml_content.split('```json')[1].strip()
-                    yaml_content = yaml_content[:-3].strip()
+                yaml_content = _strip_code_fence(yaml_content).strip()
 
                 # Attempt to parse as JSON first
                 try:
                     data = json.loads(yaml_content)
                 except json.JSONDecodeError:
-                    # If not JSON, assume it's already YAML string
-                    data = yaml.safe_load(yaml_content)
+                    # If not JSON, assume it's already YAML string; parse only to validate it
+                    # and write the text as returned instead of re-emitting it
+                    yaml.load(yaml_content, Loader=SafeLoader)
+                    with open(self.pricing2yaml_file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as file:
+                        file.write(yaml_content + '\n')
+                    return
             else:
                 data = yaml_content
             
-            with open(self.pricing2yaml_file_path, 'w', encoding='utf-8') as file:
-                yaml.dump(data, file, default_flow_style=False, sort_keys=False, allow_unicode=True)
+            with open(self.pricing2yaml_file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as file:
+                yaml.dump(data, file, Dumper=SafeDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
                 
         except Exception as e:
             logger.error(f"Failed to save updated YAML: {e}")
             raise ValueError(f"Cannot save updated YAML file: {e}")
+        finally:
+            # A rewrite within the same mtime tick could keep the same key, so drop cached parses
+            clear_yaml_file_cache()
     
     def _regenerate_markdown_from_yaml(self, updated_yaml_content: Union[str, Dict[str, Any]]) -> str:
         """Regenerate markdown from the updated YAML content."""
@@ -323,31 +418,16 @@ class ValidateAlignment:
             try:
                 yaml_data = json.loads(updated_yaml_content)
             except json.JSONDecodeError:
-                yaml_data = yaml.safe_load(updated_yaml_content)
+                yaml_data = yaml.load(updated_yaml_content, Loader=SafeLoader)
         else:
             yaml_data = updated_yaml_content
         
-        prompt_template = self.prompts.get("generate_ideal_markdown")
+        prompt = self._build_generate_ideal_markdown_prompt(json.dumps(yaml_data, indent=2))
         
-        prompt = prompt_template.format(
-            pricing2yaml_specification=self.pricing2yaml_specification,
-            pricing2yaml_content=json.dumps(yaml_data, indent=2)
-        )
-        
-        response = self.ai_client.make_full_request(
-            prompt,
-            endpoint=self.endpoint or "ValidateAlignment",
-            function="regenerate_markdown_from_updated_yaml",
-            transformation_call_id=self.transformation_call_id,
-            llm_call_ids=self.llm_call_ids,
-            json_output=False
-        )
+        response = self._llm(prompt, function="regenerate_markdown_from_updated_yaml", json_output=False)
         
         # Remove markdown code blocks if present
-        if response.startswith('```'): 
-            response = response.split('```')[1]
-        if response.endswith('```'):
-            response = response[:-3]
+        response = _strip_code_fence(response)
         
         return response.strip()
     
@@ -361,10 +441,12 @@ class ValidateAlignment:
         2) In non-table lines, collapse any run of 4 or more hyphens into exactly
         `non_table_dash_limit` hyphens (e.g. '----' → '---').
         """
+        # Both rules need a run of at least this many hyphens; most text has none
+        if '-' * min(4, max_table_dashes + 1) not in md_text:
+            return md_text.strip()
+
         # Pattern for table lines: optional ':' prefix, > max_table_dashes hyphens, optional ':' suffix
-        table_pattern = re.compile(
-            rf"(?P<prefix>:?)(?P<dashes>-{{{max_table_dashes+1},}})(?P<suffix>:?)"
-        )
+        table_pattern = _TABLE_DASH_RE if max_table_dashes == 50 else _table_dash_pattern(max_table_dashes)
 
         def clamp_table(match):
             """
@@ -373,7 +455,8 @@ class ValidateAlignment:
             return f"{match.group('prefix')}{'-' * max_table_dashes}{match.group('suffix')}"
 
         # Pattern for non-table lines: any run of 4 or more hyphens
-        non_table_pattern = re.compile(r'-{4,}')
+        non_table_pattern = _NON_TABLE_DASH_RE
+        non_table_dashes = '-' * non_table_dash_limit
 
         out_lines = []
         for line in md_text.splitlines(keepends=True):
@@ -382,7 +465,7 @@ class ValidateAlignment:
                 new_line = table_pattern.sub(clamp_table, line)
             else:
                 # Collapse long dash runs in non-table lines
-                new_line = non_table_pattern.sub('-' * non_table_dash_limit, line)
+                new_line = non_table_pattern.sub(non_table_dashes, line)
             out_lines.append(new_line)
 
         return ''.join(out_lines).strip()
\ No newline at end of file